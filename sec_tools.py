@@ -1,17 +1,28 @@
 import os
+import csv
 import time
+import asyncio
+import threading
 import json
 import math
 import gzip
 import io
 import re
+import shutil
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import List, Dict, Optional, Tuple
+from typing import IO, Iterator, List, Dict, Optional, Tuple, Union
 
+import aiohttp
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import numpy as np
 import pandas as pd
-import xml.etree.ElementTree as ET
-import matplotlib.pyplot as plt
+from lxml import etree
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 
 SEC_BASE = "https://www.sec.gov"
 HEADERS = {
@@ -19,14 +30,102 @@ HEADERS = {
     "Accept-Encoding": "gzip, deflate",
     "Host": "www.sec.gov",
 }
+CACHE_DIR = os.path.join("data", ".cache")
+# master.idx Filename -> (CIK, accession with dashes)
+_ACC_RE = re.compile(r"edgar/data/(\d+)/(\d{10}-\d{2}-\d{6})\.txt")
+# Looser accession-like match for non-standard Filename values
+_ACC_FALLBACK = re.compile(r"edgar/data/(\d+)/([0-9-]+)\.txt")
+MASTER_IDX_COLUMNS = ["CIK","Company Name","Form Type","Date Filed","Filename"]
+# Columns carried per filing in the span arrays returned by list_form4_filings_for_range
+SPAN_COLUMNS = ["CIK","Company Name","Form Type","Filename","date"]
+TRANSACTION_COLUMNS = ["issuerSymbol","issuerName","transactionCode","shares","price","date","ownership",
+                       "accession","filingDate"]
+_CATEGORY_COLUMNS = ["issuerSymbol","issuerName","transactionCode","ownership"]
+# Fixed Form 4 XML names; the first is fetched blind before falling back to index.json
+_FORM4_XML_NAMES = ("primary_doc.xml", "form4.xml")
 
-def _http_get(url: str, sleep: float = 0.2) -> bytes:
+# One pooled session keeps TLS connections to www.sec.gov warm across calls
+_SESSION = requests.Session()
+_SESSION.headers.update(HEADERS)
+_ADAPTER = HTTPAdapter(
+    pool_connections=10, pool_maxsize=10,
+    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504]),
+)
+_SESSION.mount("http://", _ADAPTER)
+_SESSION.mount("https://", _ADAPTER)
+
+class _TokenBucket:
+    """Refill-on-demand token bucket; subclasses decide how to wait."""
+    def __init__(self, rate: float = 10):
+        self._rate = rate
+        self._tokens = rate
+        self._last = time.monotonic()
+
+    def _take(self) -> float:
+        """Take a token if one is available; otherwise return seconds until one is."""
+        now = time.monotonic()
+        self._tokens = min(self._rate, self._tokens + (now - self._last) * self._rate)
+        self._last = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0.0
+        return (1 - self._tokens) / self._rate
+
+class RateLimiter(_TokenBucket):
+    """Thread-safe token bucket shared by every sync SEC request."""
+    def __init__(self, rate: float = 10):
+        super().__init__(rate)
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            wait = self._take()
+            while wait:
+                time.sleep(wait)
+                wait = self._take()
+
+class AsyncRateLimiter(_TokenBucket):
+    """asyncio twin of RateLimiter for the coroutines of one aiohttp session."""
+    def __init__(self, rate: float = 10):
+        super().__init__(rate)
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            wait = self._take()
+            while wait:
+                await asyncio.sleep(wait)
+                wait = self._take()
+
+# SEC fair access: at most 10 requests/second
+_LIMITER = RateLimiter(10)
+
+def _http_get(url: str) -> bytes:
     """GET with polite rate limiting and gzip support."""
-    time.sleep(sleep)
-    r = requests.get(url, headers=HEADERS, timeout=30)
+    _LIMITER.acquire()
+    r = _SESSION.get(url, timeout=30)
     r.raise_for_status()
     return r.content
 
+def _http_get_stream(url: str) -> requests.Response:
+    """Rate-limited streaming GET; read the gzip-decoded body from .raw, then close."""
+    _LIMITER.acquire()
+    r = _SESSION.get(url, stream=True, timeout=30)
+    if not r.ok:
+        r.close()
+    r.raise_for_status()
+    r.raw.decode_content = True
+    # Keep .raw "open" at EOF so io wrappers can drain their buffers
+    r.raw.auto_close = False
+    return r
+
+async def _http_get_async(session: aiohttp.ClientSession, limiter: AsyncRateLimiter, url: str) -> bytes:
+    """Async GET through the shared session, gated by the token bucket."""
+    await limiter.acquire()
+    async with session.get(url, timeout=aiohttp.ClientTimeout(total=30)) as r:
+        r.raise_for_status()
+        return await r.read()
+
 def _quarter_of(dt: datetime) -> int:
     return (dt.month - 1)//3 + 1
 
@@ -36,32 +135,82 @@ def _idx_url_for_date(dt: datetime) -> str:
     ds = dt.strftime("%Y%m%d")
     return f"{SEC_BASE}/Archives/edgar/daily-index/{y}/Q{q}/master.{ds}.idx"
 
-def fetch_daily_master_idx(dt: datetime) -> pd.DataFrame:
+def _idx_cache_path(cache_dir: str, dt: datetime) -> str:
+    return os.path.join(cache_dir, f"master.{dt.strftime('%Y%m%d')}.idx.gz")
+
+def _idx_is_final(dt: datetime) -> bool:
+    """Indexes older than yesterday (UTC) no longer change and are safe to cache."""
+    return dt.date() < (datetime.now(timezone.utc) - timedelta(days=1)).date()
+
+@contextmanager
+def _open_idx(dt: datetime, cache_dir: Optional[str]) -> Iterator[IO[bytes]]:
+    """
+    Binary stream of master.idx for dt. Final indexes are streamed into cache_dir on
+    first download and read back from it; others (or all, with cache_dir=None) stream
+    straight off the wire.
+    """
+    final = cache_dir is not None and _idx_is_final(dt)
+    path = _idx_cache_path(cache_dir, dt) if final else None
+    # Only trust entries written after the indexed day had settled
+    settled_at = datetime(dt.year, dt.month, dt.day, tzinfo=timezone.utc) + timedelta(days=2)
+    if not (final and os.path.exists(path) and os.path.getmtime(path) >= settled_at.timestamp()):
+        with _http_get_stream(_idx_url_for_date(dt)) as r:
+            if not final:
+                yield r.raw
+                return
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp = path + ".tmp"
+            with gzip.open(tmp, "wb") as f:
+                shutil.copyfileobj(r.raw, f)
+            os.replace(tmp, path)
+    with gzip.open(path, "rb") as f:
+        yield f
+
+def fetch_daily_master_idx(dt: datetime, cache_dir: Optional[str] = CACHE_DIR) -> pd.DataFrame:
     """
     Download and parse master.YYYYMMDD.idx into a DataFrame with columns:
     CIK | Company Name | Form Type | Date Filed | Filename
     """
-    url = _idx_url_for_date(dt)
-    raw = _http_get(url)
-    text = raw.decode("latin-1", errors="ignore")
-    # Find the header delimiter line and parse pipe-delimited body
-    lines = text.splitlines()
-    # Data starts after a line that begins with '-----'
-    start = 0
-    for i, line in enumerate(lines):
-        if line.startswith("-----"):
-            start = i + 1
-    data_lines = [ln for ln in lines[start:] if "|" in ln]
-    rows = [ln.split("|") for ln in data_lines]
-    if not rows:
-        return pd.DataFrame(columns=["CIK","Company Name","Form Type","Date Filed","Filename"])
-    df = pd.DataFrame(rows, columns=["CIK","Company Name","Form Type","Date Filed","Filename"])
+    with _open_idx(dt, cache_dir) as raw:
+        text = io.TextIOWrapper(raw, encoding="latin-1", errors="ignore")
+        # Data starts after the line that begins with '-----'
+        for line in text:
+            if line.startswith("-----"):
+                break
+        try:
+            df = pd.read_csv(
+                text, sep="|", names=MASTER_IDX_COLUMNS, header=None, engine="c",
+                dtype={"CIK": "string", "Company Name": "string", "Form Type": "category",
+                       "Date Filed": "string", "Filename": "string"},
+                quoting=csv.QUOTE_NONE, keep_default_na=False, na_values={"Filename": [""]},
+                on_bad_lines="skip",
+            )
+        except pd.errors.EmptyDataError:
+            return pd.DataFrame(columns=MASTER_IDX_COLUMNS)
+    # Lines without the full set of fields come back with a missing Filename
+    return df.dropna(subset=["Filename"]).reset_index(drop=True)
+
+def _fetch_form4_filings_for_date(d: datetime, cache_dir: Optional[str]) -> Optional[pd.DataFrame]:
+    """Form 4/4A rows of one daily index, or None when the index is unavailable."""
+    try:
+        df = fetch_daily_master_idx(d, cache_dir)
+    except requests.HTTPError:
+        # Index may not exist yet for today; skip quietly
+        return None
+    except Exception:
+        return None
+    if df.empty:
+        return None
+    df = df[df["Form Type"].isin(["4","4/A"])].copy()
+    df["date"] = d.strftime("%Y-%m-%d")
     return df
 
-def list_form4_filings_for_range(start_dt: datetime, end_dt: datetime) -> pd.DataFrame:
+def list_form4_filings_for_range(start_dt: datetime, end_dt: datetime,
+                                 cache_dir: Optional[str] = CACHE_DIR) -> Dict[str, np.ndarray]:
     """
     Collect all Form 4/4A filings from daily master index for each date in [start_dt, end_dt].
     Dates are in US ET per SEC daily index; we use UTC dates as approximation.
+    Returns a dict of SPAN_COLUMNS -> equal-length numpy arrays, one entry per filing.
     """
     dates = []
     cur = start_dt
@@ -69,25 +218,18 @@ def list_form4_filings_for_range(start_dt: datetime, end_dt: datetime) -> pd.Dat
         dates.append(cur)
         cur += timedelta(days=1)
 
-    frames = []
-    for d in dates:
-        try:
-            df = fetch_daily_master_idx(d)
-            if not df.empty:
-                df = df[df["Form Type"].isin(["4","4/A"])].copy()
-                df["date"] = d.strftime("%Y-%m-%d")
-                frames.append(df)
-        except requests.HTTPError:
-            # Index may not exist yet for today; skip quietly
-            continue
-        except Exception:
-            continue
-    if frames:
-        out = pd.concat(frames, ignore_index=True)
+    # Indexes are independent; overlap their download latency
+    with ThreadPoolExecutor(max_workers=4) as ex:
+        frames = [df for df in ex.map(lambda d: _fetch_form4_filings_for_date(d, cache_dir), dates)
+                  if df is not None and not df.empty]
+    if not frames:
+        return {c: np.array([], dtype=object) for c in SPAN_COLUMNS}
+    for df in frames:
         # Normalize some fields
-        out["CIK"] = out["CIK"].astype(str).str.zfill(10)
-        return out
-    return pd.DataFrame(columns=["CIK","Company Name","Form Type","Date Filed","Filename","date"])
+        df["CIK"] = df["CIK"].astype(str).str.zfill(10)
+    # Concatenate per column; no combined DataFrame is ever built. Object arrays share the
+    # Python str objects instead of padding every row to the longest name like "<U" would.
+    return {c: np.concatenate([df[c].to_numpy(dtype=object) for df in frames]) for c in SPAN_COLUMNS}
 
 def _dir_index_json_url(cik: str, accession_no_dashes: str) -> str:
     return f"{SEC_BASE}/Archives/edgar/data/{int(cik)}/{accession_no_dashes}/index.json"
@@ -95,10 +237,10 @@ def _dir_index_json_url(cik: str, accession_no_dashes: str) -> str:
 def _extract_accession_and_dirpath(filename: str) -> Tuple[str,str]:
     # Example filename: edgar/data/320193/0000320193-25-000123.txt
     # dir URL uses accession with NO dashes: 000032019325000123
-    m = re.search(r"edgar/data/(\d+)/(\d{10}-\d{2}-\d{6})\.txt", filename)
+    m = _ACC_RE.search(filename)
     if not m:
         # Fallback: try any accession-like
-        m2 = re.search(r"edgar/data/(\d+)/([0-9-]+)\.txt", filename)
+        m2 = _ACC_FALLBACK.search(filename)
         if not m2:
             raise ValueError(f"Cannot parse filename: {filename}")
         cik = m2.group(1)
@@ -120,45 +262,104 @@ def find_form4_xml_url(cik: str, filename: str) -> Optional[str]:
         data = json.loads(_http_get(idx_url).decode("utf-8"))
     except Exception:
         return None
+    return _pick_form4_xml_url(data, dirpath)
+
+def _pick_form4_xml_url(index_json: Dict, dirpath: str) -> Optional[str]:
     # Look for typical names
-    for f in data.get("directory", {}).get("item", []):
+    for f in index_json.get("directory", {}).get("item", []):
         name = f.get("name","").lower()
-        if name == "form4.xml" or name.endswith("_form4.xml") or (name.endswith(".xml") and "form4" in name):
+        if name in _FORM4_XML_NAMES or name.endswith("_form4.xml") or (name.endswith(".xml") and "form4" in name):
             return f"{dirpath}/{f['name']}"
     return None
 
-def parse_form4_xml(xml_bytes: bytes) -> Dict:
+async def _find_form4_xml_url_async(session: aiohttp.ClientSession, limiter: AsyncRateLimiter,
+                                    cik: str, accession: str, dirpath: str) -> Optional[str]:
+    """Async twin of find_form4_xml_url, taking the pre-parsed accession and dirpath."""
+    idx_url = _dir_index_json_url(cik, accession)
+    try:
+        data = json.loads((await _http_get_async(session, limiter, idx_url)).decode("utf-8"))
+    except Exception:
+        return None
+    return _pick_form4_xml_url(data, dirpath)
+
+async def _fetch_form4_xml_async(session: aiohttp.ClientSession, limiter: AsyncRateLimiter,
+                                 cik: str, accession: str, dirpath: str) -> Optional[bytes]:
     """
-    Return structured insider transactions from a Form 4 XML.
+    Download the Form 4 XML for one filing. The most common fixed name is fetched blind (1 request
+    on a hit); on a 404 it falls back to index.json (3 requests, vs 2 for index.json alone).
     """
-    root = ET.fromstring(xml_bytes)
-    ns = {"ns": root.tag.split("}")[0].strip("{")} if "}" in root.tag else {}
-    def gx(path):
-        return root.findall(path, ns) if ns else root.findall(path)
+    try:
+        return await _http_get_async(session, limiter, f"{dirpath}/{_FORM4_XML_NAMES[0]}")
+    except aiohttp.ClientResponseError as e:
+        if e.status != 404:
+            raise
+    xml_url = await _find_form4_xml_url_async(session, limiter, cik, accession, dirpath)
+    if not xml_url:
+        return None
+    return await _http_get_async(session, limiter, xml_url)
+
+def _local_xpath(*steps: str) -> etree.XPath:
+    """Compiled string() XPath matching each step by local name, so namespaced docs work too."""
+    path = "/".join(f"*[local-name()='{step}']" for step in steps)
+    return etree.XPath(f"string({path})")
 
-    issuer_sym = (root.findtext(".//issuerTradingSymbol", default="") or "").strip()
-    issuer_name = (root.findtext(".//issuerName", default="") or "").strip()
+# Compiled once; string() yields "" for missing nodes
+_XP_CODE = _local_xpath("transactionCoding", "transactionCode")
+_XP_SHARES = _local_xpath("transactionAmounts", "transactionShares", "value")
+_XP_PRICE = _local_xpath("transactionAmounts", "transactionPricePerShare", "value")
+_XP_DATE = _local_xpath("transactionDate", "value")
+_XP_OWNERSHIP = _local_xpath("ownershipNature", "directOrIndirectOwnership", "value")
+
+def parse_form4_xml(xml_bytes: Union[bytes, IO[bytes]]) -> Dict:
+    """
+    Return structured insider transactions from a Form 4 XML (bytes or a binary stream).
+    Stream-parsed: every finished top-level section and each entry inside one (transactions,
+    holdings, footnotes) is detached as it closes, so footnote trees never pile up.
+    """
+    issuer_sym = None
+    issuer_name = None
+    raw_txs = []
+    source = io.BytesIO(xml_bytes) if isinstance(xml_bytes, (bytes, bytearray)) else xml_bytes
+    depth = 0
+    for event, elem in etree.iterparse(source, events=("start", "end")):
+        if event == "start":
+            depth += 1
+            continue
+        depth -= 1
+        tag = etree.QName(elem).localname
+        if tag == "issuerTradingSymbol" and issuer_sym is None:
+            issuer_sym = (elem.text or "").strip()
+        elif tag == "issuerName" and issuer_name is None:
+            issuer_name = (elem.text or "").strip()
+        elif tag == "nonDerivativeTransaction":
+            raw_txs.append((_XP_CODE(elem), _XP_SHARES(elem), _XP_PRICE(elem),
+                            _XP_DATE(elem) or None, _XP_OWNERSHIP(elem) or None))
+        if depth in (1, 2):
+            # A top-level section, or an entry inside one, just closed; drop it
+            elem.clear()
+            elem.getparent().remove(elem)
+    issuer_sym = issuer_sym or ""
+    issuer_name = issuer_name or ""
 
     # Collect non-derivative transactions
     tx_rows = []
-    for tx in gx(".//nonDerivativeTable/nonDerivativeTransaction"):
-        code = (tx.findtext("./transactionCoding/transactionCode", default="") or "").strip()
-        shares = tx.findtext("./transactionAmounts/transactionShares/value")
-        price = tx.findtext("./transactionAmounts/transactionPricePerShare/value")
-        date = tx.findtext("./transactionDate/value")
-        direct = tx.findtext("./ownershipNature/directOrIndirectOwnership/value")
+    for code, shares, price, date, direct in raw_txs:
         try:
-            shares = float(shares) if shares is not None else None
+            shares = float(shares) if shares else None
         except:
             shares = None
         try:
-            price = float(price) if price is not None else None
+            price = float(price) if price else None
         except:
             price = None
+        try:
+            date = datetime.strptime(date[:10], "%Y-%m-%d") if date else None
+        except ValueError:
+            date = None
         tx_rows.append({
             "issuerSymbol": issuer_sym,
             "issuerName": issuer_name,
-            "transactionCode": code,
+            "transactionCode": code.strip(),
             "shares": shares,
             "price": price,
             "date": date,
@@ -171,10 +372,10 @@ def parse_form4_xml(xml_bytes: bytes) -> Dict:
         "transactions": tx_rows
     }
 
-def collect_last24h_and_week() -> Dict[str, pd.DataFrame]:
+def collect_last24h_and_week(cache_dir: Optional[str] = CACHE_DIR) -> Dict[str, Dict[str, np.ndarray]]:
     """
-    Fetch Form 4 filings for last 24h and previous 7 days.
-    Returns dict of DataFrames.
+    Fetch Form 4 filings for last 24h and previous 7 days; settled indexes are cached in cache_dir.
+    Returns dict of column-array spans (see list_form4_filings_for_range).
     """
     now = datetime.now(timezone.utc)
     # SEC index is daily; approximate last 24h by using today's and yesterday's indexes
@@ -183,90 +384,256 @@ def collect_last24h_and_week() -> Dict[str, pd.DataFrame]:
     last_week_start = now - timedelta(days=8)  # inclusive
     last_week_end = now - timedelta(days=1)    # inclusive
 
-    last24_df = list_form4_filings_for_range(yesterday, today)
-    week_df = list_form4_filings_for_range(last_week_start, last_week_end)
+    last24_span = list_form4_filings_for_range(yesterday, today, cache_dir)
+    week_span = list_form4_filings_for_range(last_week_start, last_week_end, cache_dir)
 
-    return {"last24": last24_df, "week": week_df}
+    return {"last24": last24_span, "week": week_span}
 
-def build_activity_summary(filings_df: pd.DataFrame, max_filings: int = 300) -> pd.DataFrame:
-    """
-    Download and parse up to max_filings Form 4 XMLs and return transactions table.
-    """
-    rows = []
-    count = 0
-    for _, r in filings_df.iterrows():
-        if count >= max_filings:
-            break
-        cik = str(r["CIK"]).zfill(10)
-        filename = r["Filename"]
-        xml_url = find_form4_xml_url(cik, filename)
-        if not xml_url:
+async def _fetch_and_parse(session: aiohttp.ClientSession, sem: asyncio.Semaphore,
+                           limiter: AsyncRateLimiter, cik: str, accession: str, dirpath: str) -> Optional[Dict]:
+    """Locate, download and parse the Form 4 XML for one master.idx row."""
+    async with sem:
+        try:
+            xml_bytes = await _fetch_form4_xml_async(session, limiter, cik, accession, dirpath)
+            if xml_bytes is None:
+                return None
+            return parse_form4_xml(xml_bytes)
+        except Exception:
+            return None
+
+def _transactions_frame(rows: List[Dict]) -> pd.DataFrame:
+    # parse_form4_xml already yields floats and datetimes, so columns come out typed
+    df = pd.DataFrame.from_records(rows, columns=TRANSACTION_COLUMNS)
+    # shares/price stay float64: float32 sums drift (3 x 1.1 -> 3.3000001907) and lose
+    # integer precision above 2**24 shares. Only the low-cardinality text is narrowed.
+    return df.astype({"shares": "float64", "price": "float64", **{c: "category" for c in _CATEGORY_COLUMNS}})
+
+def _transactions_cache_path(cache_dir: str, filing_date: str) -> str:
+    return os.path.join(cache_dir, f"transactions_{filing_date}.parquet")
+
+def _load_cached_transactions(cache_dir: str, filing_dates) -> pd.DataFrame:
+    """Previously parsed rows for the given filing dates, including no-transaction markers."""
+    frames = []
+    for d in sorted(filing_dates):
+        path = _transactions_cache_path(cache_dir, d)
+        if not os.path.exists(path):
             continue
         try:
-            xml_bytes = _http_get(xml_url, sleep=0.15)
-            parsed = parse_form4_xml(xml_bytes)
-            for tx in parsed["transactions"]:
-                rows.append(tx)
-            count += 1
+            frames.append(pd.read_parquet(path))
         except Exception:
+            # Unreadable file: treat the day as a cache miss; the next store rewrites it
+            continue
+    if not frames:
+        return pd.DataFrame(columns=TRANSACTION_COLUMNS)
+    return pd.concat(frames, ignore_index=True)
+
+def _store_cached_transactions(cache_dir: str, cached: pd.DataFrame, fresh: pd.DataFrame):
+    """Merge freshly parsed rows into the per-filing-date Parquet files."""
+    os.makedirs(cache_dir, exist_ok=True)
+    for filing_date, new in fresh.groupby("filingDate"):
+        old = cached[cached["filingDate"] == filing_date]
+        merged = pd.concat([old, new], ignore_index=True) if not old.empty else new
+        # concat of differing categories falls back to object; restore before writing
+        merged = merged.astype({c: "category" for c in _CATEGORY_COLUMNS})
+        path = _transactions_cache_path(cache_dir, filing_date)
+        # Write aside and rename so readers never see a half-written file; the pid keeps
+        # concurrent runs (run.py and the CrewAI flow) off each other's temp file
+        tmp = f"{path}.{os.getpid()}.tmp"
+        merged.to_parquet(tmp, compression="snappy", index=False)
+        os.replace(tmp, path)
+
+async def build_activity_summary_async(filings, max_filings: int = 300,
+                                       cache_dir: Optional[str] = CACHE_DIR) -> pd.DataFrame:
+    """
+    Download and parse up to max_filings Form 4 XMLs concurrently and return transactions table.
+    filings is a span from list_form4_filings_for_range (a DataFrame with the same columns works too).
+    Requests are capped at 10 in flight and 10/sec to respect SEC fair-access limits.
+    Parsed filings are kept per filing date as Parquet under cache_dir, so later runs only
+    fetch filings they haven't seen; pass cache_dir=None to disable. Files are never pruned:
+    one per filing date accumulates until the directory is cleared.
+    """
+    rows = []
+    files = np.asarray(filings["Filename"], dtype=object)
+    if files.size == 0:
+        return pd.DataFrame(columns=TRANSACTION_COLUMNS)
+    use_cache = cache_dir is not None and "date" in filings
+    dates = np.asarray(filings["date"], dtype=object) if "date" in filings else [None] * files.size
+    ciks = np.char.zfill(np.asarray(filings["CIK"], dtype=str), 10)
+    # One vectorised regex pass; rows it misses go through the per-row parser below
+    parts = pd.Series(files, dtype=object).str.extract(_ACC_RE)
+    accessions = parts[1].str.replace("-", "", regex=False)
+    dirpaths = f"{SEC_BASE}/Archives/edgar/data/" + parts[0] + "/" + accessions
+    pending = []
+    seen = set()
+    for cik, fn, accession, dirpath, filing_date in zip(ciks, files, accessions.to_numpy(), dirpaths.to_numpy(), dates):
+        if pd.isna(accession):
+            try:
+                accession, dirpath = _extract_accession_and_dirpath(fn)
+            except ValueError:
+                continue
+        # master.idx lists a filing once per filer (issuer and each reporting owner)
+        if accession in seen:
             continue
-    if rows:
-        df = pd.DataFrame(rows)
-        # Basic cleanup
-        df["shares"] = pd.to_numeric(df["shares"], errors="coerce")
-        df["price"] = pd.to_numeric(df["price"], errors="coerce")
-        df["date"] = pd.to_datetime(df["date"], errors="coerce")
-        return df
-    return pd.DataFrame(columns=["issuerSymbol","issuerName","transactionCode","shares","price","date","ownership"])
+        seen.add(accession)
+        pending.append((cik, accession, dirpath, filing_date))
+
+    cached = _load_cached_transactions(cache_dir, set(dates)) if use_cache else None
+    done = set(cached["accession"]) if cached is not None else set()
+    kept = set()
+    to_fetch = []
+    for item in pending:
+        if item[1] not in done:
+            to_fetch.append(item)
+        elif len(kept) < max_filings:
+            # Cached filings count toward max_filings like freshly parsed ones
+            kept.add(item[1])
+    count = len(kept)
+
+    sem = asyncio.Semaphore(10)
+    limiter = AsyncRateLimiter(10)
+    connector = aiohttp.TCPConnector(limit=10, ttl_dns_cache=300)
+    async with aiohttp.ClientSession(connector=connector, headers=HEADERS) as session:
+        # Filings without a usable XML don't count; keep topping up until max_filings parse.
+        while to_fetch and count < max_filings:
+            batch, to_fetch = to_fetch[:max_filings - count], to_fetch[max_filings - count:]
+            tasks = [_fetch_and_parse(session, sem, limiter, cik, acc, dp) for cik, acc, dp, _ in batch]
+            for (_, accession, _, filing_date), parsed in zip(batch, await asyncio.gather(*tasks)):
+                if parsed is None:
+                    continue
+                extra = {"accession": accession, "filingDate": filing_date}
+                # A row without issuerSymbol marks a parsed filing that had no transactions
+                rows.extend([{**tx, **extra} for tx in parsed["transactions"]] or [extra])
+                count += 1
+
+    fresh = _transactions_frame(rows)
+    if use_cache and not fresh.empty:
+        _store_cached_transactions(cache_dir, cached, fresh)
+    frames = [df for df in (cached[cached["accession"].isin(kept)] if kept else None, fresh)
+              if df is not None and not df.empty]
+    if not frames:
+        return pd.DataFrame(columns=TRANSACTION_COLUMNS)
+    df = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+    df = df[df["issuerSymbol"].notna()].reset_index(drop=True)
+    return df.astype({"shares": "float64", "price": "float64", **{c: "category" for c in _CATEGORY_COLUMNS}})
+
+def build_activity_summary(filings, max_filings: int = 300, cache_dir: Optional[str] = CACHE_DIR) -> pd.DataFrame:
+    """
+    Download and parse up to max_filings Form 4 XMLs and return transactions table.
+    Blocking wrapper around build_activity_summary_async for sync callers (e.g. CrewAI tools).
+    Safe to call while an event loop is already running (Jupyter, async kickoffs): the
+    coroutine then gets its own loop on a worker thread.
+    """
+    coro = build_activity_summary_async(filings, max_filings=max_filings, cache_dir=cache_dir)
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with ThreadPoolExecutor(max_workers=1) as ex:
+        return ex.submit(asyncio.run, coro).result()
 
 def aggregate_by_issuer(transactions: pd.DataFrame) -> pd.DataFrame:
     if transactions.empty:
         return pd.DataFrame(columns=["issuerSymbol","nTransactions","totalShares","buys","sells"])
-    buys = transactions[transactions["transactionCode"]=="P"].groupby("issuerSymbol")["shares"].sum(min_count=1)
-    sells = transactions[transactions["transactionCode"]=="S"].groupby("issuerSymbol")["shares"].sum(min_count=1)
-    total = transactions.groupby("issuerSymbol")["shares"].sum(min_count=1)
-    n = transactions.groupby("issuerSymbol")["shares"].count()
-    out = pd.concat([n.rename("nTransactions"), total.rename("totalShares"), buys.rename("buys"), sells.rename("sells")], axis=1).fillna(0).sort_values(["nTransactions","totalShares"], ascending=False)
+    # Sign-split share columns let one groupby pass produce every aggregate
+    tx = transactions.assign(
+        _buys=transactions["shares"].where(transactions["transactionCode"]=="P", 0.0),
+        _sells=transactions["shares"].where(transactions["transactionCode"]=="S", 0.0),
+    )
+    out = tx.groupby("issuerSymbol", sort=False, observed=True).agg(
+        nTransactions=("shares", "count"),
+        totalShares=("shares", "sum"),
+        buys=("_buys", "sum"),
+        sells=("_sells", "sum"),
+    )
+    # Break ties alphabetically, as the sorted groupby keys did, so input order (e.g. cached
+    # rows ahead of fresh ones) can't reorder the ranking
+    out.index = out.index.astype(str)
+    out = out.sort_values(["nTransactions","totalShares","issuerSymbol"], ascending=[False, False, True])
     out = out.reset_index()
     return out
 
-def weekly_baseline(transactions_week: pd.DataFrame) -> float:
+def aggregate_by_issuer_from_index(filings) -> pd.DataFrame:
+    """
+    Zero-HTTP ranking straight from master.idx: nTransactions is the Form 4 filing count
+    per Company Name. master.idx lists a filing once per filer, so reporting owners
+    (individual insiders) are counted alongside issuers. Use when share/price totals
+    aren't needed. Columns: issuerName, nTransactions.
+    """
+    names, counts = np.unique(np.asarray(filings["Company Name"], dtype=object), return_counts=True)
+    order = np.argsort(-counts, kind="stable")
+    return pd.DataFrame({"issuerName": names[order], "nTransactions": counts[order]})
+
+def weekly_baseline(transactions_week) -> float:
     """Average number of transactions per day in prior 7 days."""
-    if transactions_week.empty:
-        return 0.0
-    # The weekly df contains only filenames; we need count of filings per day as baseline proxy.
+    # The weekly span contains only filenames; we need count of filings per day as baseline proxy.
     # For a reasonable baseline, use count of Form 4 filings per day.
-    counts = transactions_week.groupby("date")["Filename"].count()
-    return float(counts.mean()) if not counts.empty else 0.0
+    counts = np.unique(np.asarray(transactions_week["date"], dtype=object), return_counts=True)[1]
+    return float(counts.mean()) if counts.size else 0.0
 
-def save_chart(top_issuers: pd.DataFrame, out_path: str):
+# x-axis captions for the label columns save_chart is used with
+_AXIS_LABELS = {"issuerSymbol": "Issuer Symbol", "issuerName": "Filer Name"}
+
+def save_chart(top_issuers: pd.DataFrame, out_path: str, label_col: str = "issuerSymbol",
+               title: str = "Insider Transactions — Last 24h (count per issuer)",
+               ylabel: str = "Number of Transactions"):
     if top_issuers.empty:
         return
-    plt.figure(figsize=(10,6))
+    # Materialise the plotted data once; it is also the render cache key
     subset = top_issuers.head(15)
-    plt.bar(subset["issuerSymbol"].astype(str), subset["nTransactions"])
-    plt.title("Insider Transactions — Last 24h (count per issuer)")
-    plt.xlabel("Issuer Symbol")
-    plt.ylabel("Number of Transactions")
-    plt.xticks(rotation=45, ha="right")
-    plt.tight_layout()
-    plt.savefig(out_path, dpi=160)
-    plt.close()
-
-def run_pipeline(output_dir: str = "data", charts_dir: str = "charts", max_filings: int = 300) -> Dict:
+    labels = subset[label_col].astype(str).to_numpy(dtype=str)
+    heights = subset["nTransactions"].to_numpy(dtype=np.int64)
+    text = np.array([title, _AXIS_LABELS.get(label_col, label_col), ylabel])
+    data_path = out_path + ".npz"
+    # Skip the re-render when the plotted data and captions match the last PNG written here
+    if os.path.exists(out_path) and os.path.exists(data_path):
+        with np.load(data_path) as cached:
+            if ("text" in cached and np.array_equal(cached["text"], text)
+                    and np.array_equal(cached["labels"], labels) and np.array_equal(cached["heights"], heights)):
+                return
+    # Render straight to Agg; pyplot's global figure manager isn't needed server-side
+    fig = Figure(figsize=(10,6), dpi=160)
+    ax = fig.add_subplot(111)
+    ax.bar(labels, heights)
+    ax.set_title(text[0])
+    ax.set_xlabel(text[1])
+    ax.set_ylabel(text[2])
+    ax.tick_params(axis="x", labelrotation=45)
+    for label in ax.get_xticklabels():
+        label.set_horizontalalignment("right")
+    fig.tight_layout()
+    FigureCanvasAgg(fig).print_png(out_path)
+    np.savez(data_path, labels=labels, heights=heights, text=text)
+
+def run_pipeline(output_dir: str = "data", charts_dir: str = "charts", max_filings: int = 300,
+                 with_transactions: bool = True) -> Dict:
+    """
+    End-to-end run. with_transactions=False skips every Form 4 XML download and ranks
+    filers (issuers and reporting owners) by Form 4 filing count from the daily index alone.
+    The summary JSON and topIssuerToday then carry issuerName/nTransactions only, with no
+    issuerSymbol, totalShares, buys or sells.
+    """
     os.makedirs(output_dir, exist_ok=True)
     os.makedirs(charts_dir, exist_ok=True)
+    # Index and transaction caches live together under the output directory
+    cache_dir = os.path.join(output_dir, ".cache")
 
-    spans = collect_last24h_and_week()
-    last24_df = spans["last24"]
-    week_df = spans["week"]
+    spans = collect_last24h_and_week(cache_dir)
+    last24_span = spans["last24"]
+    week_span = spans["week"]
 
-    # Parse Form4 XML for last 24h
-    last24_tx = build_activity_summary(last24_df, max_filings=max_filings)
-    summary = aggregate_by_issuer(last24_tx)
+    if with_transactions:
+        # Parse Form4 XML for last 24h
+        last24_tx = build_activity_summary(last24_span, max_filings=max_filings, cache_dir=cache_dir)
+        summary = aggregate_by_issuer(last24_tx)
+        chart_kwargs = {"label_col": "issuerSymbol"}
+    else:
+        summary = aggregate_by_issuer_from_index(last24_span)
+        chart_kwargs = {"label_col": "issuerName",
+                        "title": "Form 4 Filings per Filer — Last 24h",
+                        "ylabel": "Number of Form 4 Filings"}
 
     # Weekly baseline by filings/day
-    baseline = weekly_baseline(week_df)
+    baseline = weekly_baseline(week_span)
 
     # Save artifacts
     last24_path = os.path.join(output_dir, "last24h_insider_summary.json")
@@ -277,7 +644,7 @@ def run_pipeline(output_dir: str = "data", charts_dir: str = "charts", max_filin
     with open(week_path, "w") as f:
         json.dump({"avg_filings_per_day_prior_7d": baseline}, f, indent=2)
 
-    save_chart(summary, chart_path)
+    save_chart(summary, chart_path, **chart_kwargs)
 
     # Compose final report
     top_row = summary.head(1).to_dict(orient="records")[0] if not summary.empty else None